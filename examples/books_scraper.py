@@ -6,16 +6,50 @@ Author: Akhilesh Talekar
 Date: December 2024
 """
 
+import argparse
+import os
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from requests_cache import CachedSession
+from urllib3.util import Retry
+from selectolax.parser import HTMLParser
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+
+BASE_URL = "https://books.toscrape.com/"
+CATALOGUE_PREFIX = BASE_URL + "catalogue/"
 
-# Using headers to mimic a real browser
-headers = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
+# Using headers to mimic a real browser; only advertise compression we
+# actually want (Brotli decode buys nothing on this small static site)
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
+    "Accept-Encoding": "gzip, deflate"
 }
 
-ratingMap = {
+# Rotating through a pool of real browser User-Agents (plus the jittered
+# per-request delay below) keeps the parallel workers from looking like
+# a single hammering client, so concurrency can be raised safely
+UA_POOL = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:120.0) Gecko/20100101 Firefox/120.0",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:121.0) Gecko/20100101 Firefox/121.0",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:121.0) Gecko/20100101 Firefox/121.0",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 Edg/120.0.0.0"
+]
+
+RATING_MAP = {
     "One": 1,
     "Two": 2,
     "Three": 3,
@@ -23,44 +57,233 @@ ratingMap = {
     "Five": 5
 }
 
-# Fetch the webpage
-url = "https://books.toscrape.com/"
-response = requests.get(url, headers=headers)
-
-# Parse HTML using BeautifulSoup
-soup = BeautifulSoup(response.text, "html.parser")
-
-# Find all book articles on the page
-articles = soup.find_all("article", class_="product_pod")
-
-items = []
-
-for article in articles:
-    # Get book title
-    book_name = article.find("h3").find("a").get("title")
-    
-    # Get book price
-    price_div = article.find("div", class_="product_price")
-    book_price = price_div.find("p", class_="price_color").text.split("£")[1]
-    
-    # Get book rating
-    book_rating = article.find("p", class_="star-rating").get("class")[1]
-    book_rating = ratingMap[book_rating]
-    
-    items.append({
-        "Title": book_name,
-        "Price": float(book_price),
-        "Rating": book_rating
+# Politeness delay (seconds) applied before every request
+REQUEST_DELAY = 1.0
+
+# How many page fetches may be in flight at once
+MAX_WORKERS = 8
+
+# Retry transient failures (timeouts, 429s, 5xx) with exponential
+# backoff instead of dropping the page; other 4xx still fail fast
+RETRIES = Retry(
+    total=3,
+    backoff_factor=1,
+    status_forcelist=[429, 500, 502, 503, 504],
+    respect_retry_after_header=True
+)
+
+# One shared session so every worker reuses pooled keep-alive connections
+# instead of paying a fresh TCP+TLS handshake per page. Responses are
+# cached to SQLite for a day, so re-runs during development only pay
+# for parsing, not re-downloading identical HTML
+SESSION = CachedSession(".cache/books", expire_after=86400, allowable_codes=(200,))
+
+
+class RateLimiter:
+    """Cap the aggregate request rate across all worker threads.
+
+    A per-worker sleep only paces each thread individually - 8 workers
+    sleeping 1s still hit the site 8 times per second. Here every
+    caller reserves the next free slot (spaced REQUEST_DELAY plus
+    jitter apart) under a lock and sleeps until it, so the whole pool
+    issues at most ~1 request per REQUEST_DELAY no matter how many
+    threads are fetching.
+    """
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.next_allowed = time.monotonic()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            pause = self.next_allowed - now
+            self.next_allowed = max(self.next_allowed, now) + self.delay + random.uniform(0, 0.5)
+        if pause > 0:
+            time.sleep(pause)
+
+
+RATE_LIMITER = RateLimiter(REQUEST_DELAY)
+SESSION.headers.update(HEADERS)
+SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=RETRIES))
+
+
+def fetch_bytes(url):
+    """Fetch a page and return its raw HTML bytes, or None on failure."""
+    # Cache hits never touch the network, so only pace real requests -
+    # otherwise a warmed-cache re-run still sleeps ~1s per page
+    if not SESSION.cache.contains(url=url):
+        RATE_LIMITER.wait()
+    try:
+        headers = {**HEADERS, "User-Agent": random.choice(UA_POOL)}
+        response = SESSION.get(url, headers=headers, timeout=10)
+        response.raise_for_status()
+        return response.content
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching {url}: {e}")
+        return None
+
+
+def fetch_page_bytes(page_number):
+    """Fetch one catalogue page by number."""
+    return fetch_bytes(f"{CATALOGUE_PREFIX}page-{page_number}.html")
+
+
+def parse_bytes(body):
+    """Parse one page's HTML bytes into five parallel column lists.
+
+    Runs in process-pool workers: it takes plain bytes and returns
+    plain lists, so nothing unpicklable crosses the process boundary.
+    """
+    return extract_page(HTMLParser(body))
+
+
+def extract_book_data(book_element):
+    """Extract title, price, rating, availability and URL from one product pod."""
+    # Get book title and link
+    link = book_element.css_first("h3 a")
+    title = link.attributes.get("title") or "Unknown Title"
+    # Hrefs are relative to the catalogue; one removeprefix plus the
+    # precomputed prefix beats three string concatenations per book
+    book_url = CATALOGUE_PREFIX + (link.attributes.get("href") or "").removeprefix("../")
+
+    # Get book price (strip the currency prefix, mojibake form first;
+    # removeprefix allocates nothing when the prefix is absent)
+    price_text = book_element.css_first("p.price_color").text()
+    price = float(price_text.removeprefix("Â£").removeprefix("£"))
+
+    # Get book rating (last CSS class holds the word, e.g. "Three")
+    rating_word = book_element.css_first("p.star-rating").attributes.get("class", "").split()[-1]
+    try:
+        rating = RATING_MAP[rating_word]
+    except KeyError:
+        rating = 0
+
+    # Get availability as a plain boolean; the "In Stock"/"Out of Stock"
+    # labels are attached once at DataFrame construction time instead of
+    # allocating a label string per book
+    in_stock = book_element.css_first("p.instock") is not None
+
+    return title, price, rating, in_stock, book_url
+
+
+def extract_page(tree):
+    """Extract five parallel column lists from a parsed catalogue page."""
+    titles, prices, ratings, avails, urls = [], [], [], [], []
+    for book in tree.css("article.product_pod"):
+        title, price, rating, in_stock, book_url = extract_book_data(book)
+        titles.append(title)
+        prices.append(price)
+        ratings.append(rating)
+        avails.append(in_stock)
+        urls.append(book_url)
+    return titles, prices, ratings, avails, urls
+
+
+def scrape_all_books(max_pages=50):
+    """Scrape the whole catalogue (up to max_pages pages) in parallel.
+
+    Returns five flat column lists (titles, prices, ratings,
+    availability, URLs) ready for batch DataFrame construction.
+    """
+    # Fetch page 1 first: its pager says "Page 1 of N", so we dispatch
+    # exactly N fetches instead of blindly walking 404s past the end
+    first_body = fetch_bytes(f"{CATALOGUE_PREFIX}page-1.html")
+    if first_body is None:
+        return [], [], [], [], []
+    first = HTMLParser(first_body)
+    columns = extract_page(first)
+
+    pager = first.css_first("li.current")
+    total_pages = int(pager.text().split("of")[-1].strip()) if pager else 1
+    total_pages = min(total_pages, max_pages)
+
+    # Threads keep the network saturated (I/O-bound fetches), while the
+    # GIL-bound tree walk is farmed out to one parser process per core;
+    # the two pools overlap since map() hands bodies over lazily
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as fetch_pool, \
+            ProcessPoolExecutor(max_workers=os.cpu_count()) as parse_pool:
+        bodies = fetch_pool.map(fetch_page_bytes, range(2, total_pages + 1))
+        pages = parse_pool.map(parse_bytes, (body for body in bodies if body is not None))
+        for page_columns in pages:
+            for column, page_column in zip(columns, page_columns):
+                column.extend(page_column)
+    print(f"Total books extracted: {len(columns[0])}\n")
+    return columns
+
+
+def create_dataframe(columns):
+    """Build a DataFrame from column lists, sorted by rating then price."""
+    titles, prices, ratings, avails, urls = columns
+    # Column-at-a-time construction skips pandas hashing five dict keys
+    # per row, and explicit dtypes roughly halve the frame's memory
+    df = pd.DataFrame({
+        "Title": titles,
+        "Price (£)": pd.array(prices, dtype="float32"),
+        "Rating": pd.array(ratings, dtype="int8"),
+        "Availability": pd.Categorical.from_codes(
+            np.asarray(avails, dtype="int8"), ["Out of Stock", "In Stock"]),
+        "URL": urls
     })
+    # np.lexsort computes the order in one pass over the contiguous
+    # ndarrays (last key is primary: rating descending, price ascending),
+    # skipping the per-column key coercion sort_values does
+    order = np.lexsort((df["Price (£)"].to_numpy(), -df["Rating"].to_numpy()))
+    return df.iloc[order].reset_index(drop=True)
+
+
+def save_to_csv(df, filename="output/books_data.csv"):
+    """Export the DataFrame to CSV."""
+    # pyarrow's writer runs in multithreaded C code, several times
+    # faster than pandas' Python-level serialization of string columns
+    pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), filename)
+    print(f"✅ Saved {len(df)} books to {filename}")
+
+
+def save_to_parquet(df, filename="output/books_data.parquet"):
+    """Export the DataFrame to Parquet."""
+    # Parquet writes ~10x faster than Excel, compresses far smaller and
+    # round-trips the dtypes (float32, int8, Categorical) exactly
+    df.to_parquet(filename, engine="pyarrow", compression="zstd", index=False)
+    print(f"✅ Saved {len(df)} books to {filename}")
+
+
+def save_to_excel(df, filename="output/books_data.xlsx"):
+    """Export the DataFrame to Excel."""
+    # xlsxwriter writes the same file several times faster than openpyxl
+    df.to_excel(filename, index=False, engine="xlsxwriter")
+    print(f"✅ Saved {len(df)} books to {filename}")
+
+
+def display_summary(df):
+    """Print a quick overview of the scraped data."""
+    print(f"Total books: {len(df)}")
+    print(f"Average price: £{df['Price (£)'].mean():.2f}")
+    print("\nRating distribution:")
+    print(df["Rating"].value_counts().sort_index(ascending=False).to_string())
+    print("\nTop 5 highest-rated affordable books:")
+    # Heap-select the best-rated rows and the cheapest among them in
+    # O(n log 5) - no reliance on the frame arriving pre-sorted
+    top5 = df.nlargest(5, "Rating", keep="all").nsmallest(5, "Price (£)")
+    print(top5[["Title", "Price (£)", "Rating"]].to_string(index=False))
+
 
-print(f"Total books extracted: {len(items)}\n")
+def main():
+    parser = argparse.ArgumentParser(description="Scrape book data from books.toscrape.com")
+    parser.add_argument("--xlsx", action="store_true",
+                        help="also export an Excel file (slower; Parquet and CSV are always written)")
+    args = parser.parse_args()
 
-# Create DataFrame
-df = pd.DataFrame(items)
-print(df.head(10))
+    columns = scrape_all_books(max_pages=50)
+    df = create_dataframe(columns)
+    display_summary(df)
+    save_to_csv(df)
+    save_to_parquet(df)
+    if args.xlsx:
+        save_to_excel(df)
+    print("\n✅ Scraping completed!")
 
-# Export to CSV and Excel
-df.to_csv("books_data.csv", index=False)
-df.to_excel("books_data.xlsx", index=False)
 
-print("\n✅ Scraping completed!")
+if __name__ == "__main__":
+    main()